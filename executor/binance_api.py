@@ -1,11 +1,15 @@
 from decimal import Decimal
 import os
 import logging
-from typing import Optional, Mapping
+import threading
+import time
+from typing import Optional, Mapping, Union
 
+import numpy as np
 import pandas as pd
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 # ─── Environment Configuration ───────────────────────────────────────────────
@@ -45,6 +49,33 @@ def connect_binance(testnet: bool = True) -> Client:
     logging.info("Connected to Binance %s.", "testnet" if testnet else "production")
     return client
 
+def connect_binance_production() -> Client:
+    """Create and verify a production Binance Client."""
+    return connect_binance(testnet=False)
+
+# ─── Process-wide Shared Client ──────────────────────────────────────────────
+_SHARED_CLIENT: Optional[Client] = None
+_shared_client_lock = threading.Lock()
+
+def get_shared_client() -> Client:
+    """
+    Return the process-wide production Client, connecting on first use.
+
+    Every strategy/runner thread shares it, so there is one HTTPS connection
+    pool, one set of TLS handshakes and one place that accounts for rate
+    limits. The underlying requests.Session gets a pool large enough for
+    concurrent runner threads.
+    """
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _shared_client_lock:
+            if _SHARED_CLIENT is None:
+                client = connect_binance_production()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                client.session.mount("https://", adapter)
+                _SHARED_CLIENT = client
+    return _SHARED_CLIENT
+
 # ─── Order Execution with Retry ─────────────────────────────────────────────
 @retry(
     reraise=True,
@@ -143,13 +174,18 @@ def fetch_klines_df(
     client: Client,
     symbol: str,
     interval: str,
-    lookback: str
+    lookback: Union[str, int]
 ) -> pd.DataFrame:
     """
     Fetch candlestick data into DataFrame; errors bubble up.
+    `lookback` is a date string ("100 days ago UTC") or a start time in ms.
     """
     logging.info("Fetching klines %s @ %s (%s)", symbol, interval, lookback)
     klines = client.get_historical_klines(symbol, interval, lookback)
+    return _klines_to_df(klines)
+
+def _klines_to_df(klines: list) -> pd.DataFrame:
+    """Raw Binance kline rows → typed DataFrame."""
     df = pd.DataFrame(klines, columns=[
         'open_time','open','high','low','close','volume',
         'close_time','quote_asset_volume','number_of_trades',
@@ -161,3 +197,139 @@ def fetch_klines_df(
     df['open_time'] = pd.to_datetime(df['open_time'], unit='ms', utc=True)
     df['close_time'] = pd.to_datetime(df['close_time'], unit='ms', utc=True)
     return df
+
+def fetch_klines_array(
+    client: Client,
+    symbol: str,
+    interval: str,
+    lookback: Union[str, int]
+) -> np.ndarray:
+    """
+    Fetch candlesticks straight into a (5, n) float64 array with rows
+    open_time (ms), open, high, low, close; no DataFrame is built.
+    Each row is contiguous, so it can be handed to JIT kernels as is.
+    """
+    logging.info("Fetching klines %s @ %s (%s)", symbol, interval, lookback)
+    klines = client.get_historical_klines(symbol, interval, lookback)
+    if not klines:
+        return np.empty((5, 0))
+    return np.ascontiguousarray(np.array([k[:5] for k in klines], dtype=np.float64).T)
+
+def klines_df_to_array(df: pd.DataFrame) -> np.ndarray:
+    """
+    Kline frame (e.g. a KlineCache window) → the (5, n) float64 layout of
+    `fetch_klines_array`: open_time (ms), open, high, low, close.
+    """
+    out = np.empty((5, len(df)))
+    out[0] = df["open_time"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    for row, col in enumerate(("open", "high", "low", "close"), start=1):
+        out[row] = df[col].to_numpy(np.float64)
+    return out
+
+class KlineCache:
+    """
+    Rolling kline window refreshed incrementally by `open_time`, always in
+    chronological order.
+
+    The first refresh downloads the full lookback; later ones issue a single
+    klines request from the newest cached open_time onward (that last candle
+    may still be forming, so it is replaced) and trim back to the initial size.
+    A refresh within `max_age_secs` of the previous one returns the cached
+    window without any request. Refreshes are serialized, so one cache can
+    be shared by several runner threads (see `shared_kline_cache`).
+    """
+
+    INCREMENTAL_LIMIT = 1000  # Binance max rows per klines request
+
+    def __init__(
+        self,
+        symbol: str,
+        interval: str,
+        lookback: str = "100 days ago UTC",
+        max_age_secs: float = 0.0,
+    ):
+        self.symbol = symbol
+        self.interval = interval
+        self.lookback = lookback
+        self.max_age_secs = max_age_secs
+        self._df: Optional[pd.DataFrame] = None
+        self._size = 0
+        self._fetched_at = float("-inf")  # time.monotonic() of the last request
+        self._lock = threading.RLock()
+
+    def refresh(self, client: Client) -> pd.DataFrame:
+        """Return the up-to-date window; callers must not mutate it."""
+        with self._lock:
+            if self._df is not None and time.monotonic() - self._fetched_at < self.max_age_secs:
+                return self._df
+            return self._refresh(client)
+
+    def _refresh(self, client: Client) -> pd.DataFrame:
+        if self._df is None or self._df.empty:
+            df = fetch_klines_df(client, self.symbol, self.interval, self.lookback)
+            self._size = len(df)
+        else:
+            last_ms = int(self._df["open_time"].iat[-1].timestamp() * 1000)
+            # One plain klines request: get_historical_klines would add an
+            # earliest-timestamp lookup and pagination for a handful of rows
+            rows = client.get_klines(
+                symbol=self.symbol, interval=self.interval,
+                startTime=last_ms, limit=self.INCREMENTAL_LIMIT
+            )
+            if not rows:
+                self._fetched_at = time.monotonic()
+                return self._df
+            if len(rows) >= self.INCREMENTAL_LIMIT:
+                # Too far behind for one page: start over
+                self.clear()
+                return self._refresh(client)
+            new = _klines_to_df(rows)
+            df = (
+                pd.concat([self._df.iloc[:-1], new], ignore_index=True)
+                .drop_duplicates("open_time", keep="last")
+            )
+            # Sort once here, on append, so readers never have to
+            if not df["open_time"].is_monotonic_increasing:
+                df = df.sort_values("open_time")
+            df = df.iloc[-self._size:]
+        self._df = df.reset_index(drop=True)
+        self._fetched_at = time.monotonic()
+        return self._df
+
+    def clear(self) -> None:
+        """Drop the cached window; the next refresh downloads the full lookback."""
+        with self._lock:
+            self._df = None
+            self._size = 0
+            self._fetched_at = float("-inf")
+
+# ─── Process-wide Shared Kline Windows ───────────────────────────────────────
+# Short enough that the forming candle stays fresh and that a runner waking
+# a few seconds after a candle close never gets the pre-close window; long
+# enough that runners ticking together share one request.
+SHARED_KLINES_MAX_AGE_SECS = 5.0
+
+_SHARED_KLINES: dict[tuple[str, str, str], KlineCache] = {}
+_shared_klines_lock = threading.Lock()
+
+def shared_kline_cache(symbol: str, interval: str, lookback: str = "100 days ago UTC") -> KlineCache:
+    """
+    Return the process-wide KlineCache for (symbol, interval, lookback).
+
+    Runner threads watching the same market share one window, so each
+    refresh period costs one klines request instead of one per runner.
+    """
+    key = (symbol, interval, lookback)
+    with _shared_klines_lock:
+        cache = _SHARED_KLINES.get(key)
+        if cache is None:
+            cache = KlineCache(symbol, interval, lookback, SHARED_KLINES_MAX_AGE_SECS)
+            _SHARED_KLINES[key] = cache
+        return cache
+
+def clear_shared_kline_caches(symbol: Optional[str] = None) -> None:
+    """Drop the shared windows (of one symbol, or all); they reload on next use."""
+    with _shared_klines_lock:
+        caches = [c for c in _SHARED_KLINES.values() if symbol is None or c.symbol == symbol]
+    for cache in caches:
+        cache.clear()
@@ -1,5 +1,6 @@
 # tfg_bot_trading/executor/normalization.py
 
+import sys
 from typing import Any, Dict, Union
 
 # ─── Typo Mappings (all keys pre-lowercased) ─────────────────────────────────
@@ -16,6 +17,12 @@ _ACTION_NORMALIZATION_MAPPING: Dict[str, str] = {
 }
 
 
+# Canonical action values, interned so downstream `==` checks hit the identity fast path.
+_CANONICAL_ACTIONS: Dict[str, str] = {
+    a: sys.intern(a) for a in ("HOLD", "BUY", "SELL", "STRATEGY", "DIRECT_ORDER")
+}
+
+
 # ─── Strategy Params Normalization ───────────────────────────────────────────
 def normalize_strategy_params(params: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -46,6 +53,9 @@ def normalize_action(action: str) -> str:
     Normalize action strings by mapping known typos to their canonical form.
     Case-insensitive; returns the original action (uppercased) if no match.
     """
+    hit = _CANONICAL_ACTIONS.get(action)
+    if hit is not None:
+        return hit
     action_lower = action.lower()
     normalized = _ACTION_NORMALIZATION_MAPPING.get(action_lower, action_upper := action.upper())
     return normalized if normalized.isupper() else action_upper
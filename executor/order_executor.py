@@ -5,17 +5,61 @@ import os
 import json
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Callable, Optional, Dict, Any, List
 
 import numpy as np
+import orjson
 
 from .binance_api import place_order, list_open_orders, cancel_order
 from .normalization import normalize_strategy_params
 
 # ─── Globals & Concurrency ────────────────────────────────────────────────────
+class _ReadWriteLock:
+    """
+    Many concurrent readers or a single writer. Waiting writers block new
+    readers so saves are not starved by frequent loads.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read_lock(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 POSITION_STATE_FILE = "position_state.json"
-_position_lock = threading.Lock()
+_position_lock = _ReadWriteLock()
 
 # Default order size if LLM no lo proporciona
 DEFAULT_STRATEGY_ORDER_SIZE = 0.01
@@ -32,28 +76,39 @@ def _default_converter(obj):
 
 # ─── Position State Persistence ──────────────────────────────────────────────
 def save_position_state(position: dict) -> None:
-    with _position_lock:
+    with _position_lock.write_lock():
         try:
             ts = position.get("timestamp")
             if isinstance(ts, datetime):
                 if ts.tzinfo is None:
                     ts = ts.replace(tzinfo=timezone.utc)
-                position["timestamp"] = ts.isoformat()
-            with open(POSITION_STATE_FILE, "w") as f:
-                json.dump(position, f, indent=4, default=_default_converter)
+                position["timestamp"] = ts.timestamp()  # epoch seconds
+            # Build the payload in memory and write it once, then swap atomically
+            payload = orjson.dumps(
+                position,
+                default=_default_converter,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+            )
+            tmp = POSITION_STATE_FILE + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, POSITION_STATE_FILE)
             logging.info("Position state saved.")
         except Exception as e:
             logging.error("Error saving position state: %s", e)
 
 def load_position_state() -> Optional[dict]:
-    with _position_lock:
+    with _position_lock.read_lock():
         if not os.path.exists(POSITION_STATE_FILE):
             return None
         try:
             with open(POSITION_STATE_FILE, "r") as f:
                 pos = json.load(f)
             ts = pos.get("timestamp")
-            if ts:
+            if isinstance(ts, (int, float)):
+                pos["timestamp"] = datetime.fromtimestamp(ts, tz=timezone.utc)
+            elif ts:
+                # legacy files stored an ISO-8601 string
                 dt = datetime.fromisoformat(ts)
                 if dt.tzinfo is None:
                     dt = dt.replace(tzinfo=timezone.utc)
@@ -66,23 +121,48 @@ def load_position_state() -> Optional[dict]:
 # ─── Market Price Extraction ─────────────────────────────────────────────────
 def get_current_price(data_json: str) -> float:
     try:
-        d = json.loads(data_json)
+        # orjson reads str input in place: no encode() copy, no buffer to manage
+        d = orjson.loads(data_json)
         return float(d.get("real_time_data", {}).get("current_price_usd", 40000.0))
     except Exception as e:
         logging.warning("Failed to parse current price, using fallback. %s", e)
         return 40000.0
 
 # ─── Helpers Comunes ─────────────────────────────────────────────────────────
+_MAX_CANCEL_WORKERS = 8
+
 def _cleanup_conflicts(client, side: str) -> None:
-    for order in list_open_orders(client, "BTCUSDT"):
-        if order["side"] != side:
-            cancel_order(client, "BTCUSDT", order["orderId"])
+    """
+    Cancel open orders on the opposite side, issuing the requests in parallel.
+    Every cancel is attempted; if any fails, the first failure is re-raised so
+    no new order is placed while opposing orders may still be live.
+    """
+    conflicts = [o for o in list_open_orders(client, "BTCUSDT") if o["side"] != side]
+    if not conflicts:
+        return
+    if len(conflicts) == 1:
+        cancel_order(client, "BTCUSDT", conflicts[0]["orderId"])
+        return
+    workers = min(_MAX_CANCEL_WORKERS, len(conflicts))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(cancel_order, client, "BTCUSDT", o["orderId"]): o["orderId"]
+            for o in conflicts
+        }
+    first_exc = None
+    for fut, order_id in futures.items():
+        exc = fut.exception()
+        if exc is not None:
+            logging.error("Cancel of order %s raised: %s", order_id, exc)
+            first_exc = first_exc or exc
+    if first_exc is not None:
+        raise first_exc
 
 def _persist_position(pos: Optional[dict]) -> None:
     if pos:
         save_position_state(pos)
     else:
-        with _position_lock:
+        with _position_lock.write_lock():
             if os.path.exists(POSITION_STATE_FILE):
                 os.remove(POSITION_STATE_FILE)
 
@@ -0,0 +1,207 @@
+# tfg_bot_trading/executor/strategies/_indicators.py
+
+"""
+Shared indicator kernels (True Range, EWMA, rolling mean/std, crossovers) plus the
+incremental trackers runner threads keep across ticks.
+
+Every strategy calls these instead of re-implementing them, so each kernel
+is JIT-compiled once (see `_njit`) and the numerics stay consistent across
+strategies. Kernels are compiled with nogil=True: strategy runners are
+threads, and the GIL is released while a kernel runs.
+"""
+
+from collections import deque
+from math import fabs, isnan, sqrt
+from typing import Optional
+
+import numpy as np
+
+from executor.strategies._njit import njit, readonly_args, NUMBA_AVAILABLE
+
+# ─── True Range ───────────────────────────────────────────────────────────────
+@njit(readonly_args("f8[:](f8[:], f8[:], f8[:])"), cache=True, nogil=True)
+def _true_range_loop(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Scalar TR loop, written as a single fabs/max expression so the JIT emits
+    branchless code.
+    """
+    n = high.shape[0]
+    tr = np.empty(n)
+    if n == 0:
+        return tr
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        pc = close[i - 1]
+        tr[i] = max(high[i] - low[i], max(fabs(high[i] - pc), fabs(low[i] - pc)))
+    return tr
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Per-candle True Range. The first candle has no previous close, so TR = high - low.
+    Uses the jitted loop when numba is available, vectorized NumPy otherwise.
+    """
+    if NUMBA_AVAILABLE:
+        return _true_range_loop(high, low, close)
+    tr = high - low
+    if tr.size > 1:
+        pc = close[:-1]
+        np.maximum(tr[1:], np.abs(high[1:] - pc), out=tr[1:])
+        np.maximum(tr[1:], np.abs(low[1:] - pc), out=tr[1:])
+    return tr
+
+# ─── EWMA ─────────────────────────────────────────────────────────────────────
+@njit(readonly_args("f8(f8[:], f8)"), cache=True, nogil=True)
+def ewma_last(x: np.ndarray, alpha: float) -> float:
+    """
+    Last value of the recursive EWMA, i.e. of pandas
+    ewm(alpha=alpha, adjust=False).mean() for a series with only leading
+    NaNs: the first finite value seeds the recursion. NaN if there is none.
+    """
+    n = x.shape[0]
+    first = 0
+    while first < n and isnan(x[first]):
+        first += 1
+    if first == n:
+        return np.nan
+    acc = x[first]
+    for i in range(first + 1, n):
+        acc = alpha * x[i] + (1.0 - alpha) * acc
+    return acc
+
+# ─── Rolling Mean / Std ───────────────────────────────────────────────────────
+@njit(readonly_args("UniTuple(f8, 2)(f8[:], i8)"), cache=True, nogil=True)
+def rolling_mean_std_last(x: np.ndarray, window: int) -> tuple[float, float]:
+    """
+    Mean and sample std (ddof=1) of the last `window` values, i.e. the last
+    row of rolling(window).mean() / .std(). NaN when there are fewer than
+    `window` values; the std is NaN for window < 2.
+
+    One pass over the window with running sum / sum of squares. Values are
+    shifted by the window's first element so the sums stay small and the
+    variance does not suffer cancellation at BTC price levels.
+    """
+    n = x.shape[0]
+    if window < 1 or n < window:
+        return np.nan, np.nan
+    start = n - window
+    k = x[start]
+    s = 0.0
+    s2 = 0.0
+    for i in range(start, n):
+        d = x[i] - k
+        s += d
+        s2 += d * d
+    m = k + s / window
+    if window < 2:
+        return m, np.nan
+    var = (s2 - s * s / window) / (window - 1)
+    return m, sqrt(max(var, 0.0))
+
+# Called from inside other kernels, so the choice is made at definition time
+# rather than in a Python wrapper like `true_range`.
+if NUMBA_AVAILABLE:
+    @njit(readonly_args("UniTuple(f8, 2)(f8[:], i8)"), cache=True, nogil=True)
+    def rolling_mean_tail(x: np.ndarray, window: int) -> tuple[float, float]:
+        """
+        (previous, last) values of rolling(window).mean(): the means of the
+        windows ending at the second-to-last and the last element. NaN when
+        there are fewer than `window + 1` values.
+
+        One pass over `window + 1` values; both windows share the inner
+        `window - 1` sum, so no rolling array is allocated.
+        """
+        n = x.shape[0]
+        if window < 1 or n < window + 1:
+            return np.nan, np.nan
+        inner = 0.0
+        for i in range(n - window, n - 1):
+            inner += x[i]
+        return (inner + x[n - 1 - window]) / window, (inner + x[n - 1]) / window
+else:  # pragma: no cover - numba is optional
+    def rolling_mean_tail(x: np.ndarray, window: int) -> tuple[float, float]:
+        """
+        (previous, last) values of rolling(window).mean(); without numba the
+        two means are NumPy reductions over views instead of a Python loop.
+        """
+        n = x.shape[0]
+        if window < 1 or n < window + 1:
+            return np.nan, np.nan
+        return float(x[n - 1 - window:n - 1].mean()), float(x[n - window:].mean())
+
+# ─── Crossovers ───────────────────────────────────────────────────────────────
+@njit("i8(f8, f8)", cache=True, nogil=True)
+def cross_code(diff_prev: float, diff_last: float) -> int:
+    """
+    Branchless cross test on a line difference (e.g. fast - slow) at the
+    previous and last candle: sign(last) - sign(prev) is +2 for an upward
+    cross (returns 1, BUY), -2 for a downward one (2, SELL), anything else
+    is 0 (HOLD). NaN has sign 0, so it never crosses.
+    """
+    code = ((diff_last > 0.0) - (diff_last < 0.0)) - ((diff_prev > 0.0) - (diff_prev < 0.0))
+    return (code == 2) + 2 * (code == -2)
+
+# ─── Incremental Trackers ─────────────────────────────────────────────────────
+class RollingMeanStd:
+    """
+    O(1)-per-candle rolling mean / sample std for runner threads.
+
+    Keeps the last `window - 1` closed values in a ring with their running
+    sum and sum of squares (taken relative to a reference value fixed at
+    rebuild, to avoid cancellation at BTC price levels); the newest value
+    (the candle that may still be forming) is added on top at query time
+    without being committed.
+    Candles are identified by open_time, so re-fetching the same window is a
+    no-op and a window that no longer contains the last folded candle
+    triggers a rebuild.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self._ring: deque = deque(maxlen=max(self.window - 1, 0))
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._ref = 0.0
+        self._last_ts: Optional[int] = None
+
+    def _push(self, v: float) -> None:
+        v -= self._ref
+        ring = self._ring
+        if ring.maxlen == 0:
+            return
+        if len(ring) == ring.maxlen:
+            old = ring[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        ring.append(v)
+        self._sum += v
+        self._sum_sq += v * v
+
+    def update(self, values: np.ndarray, open_ms: np.ndarray) -> tuple[float, float]:
+        """Fold newly closed values and return (mean, std) of the last window."""
+        n = values.shape[0]
+        if n == 0:
+            return np.nan, np.nan
+        k = -1 if self._last_ts is None else int(np.searchsorted(open_ms, self._last_ts))
+        if k < 0 or k >= n or open_ms[k] != self._last_ts:
+            self.reset()
+            first = max(n - 1 - self._ring.maxlen, 0)
+            self._ref = float(values[first])
+        else:
+            first = k + 1
+        for i in range(first, n - 1):
+            self._push(float(values[i]))
+        if n > 1:
+            self._last_ts = int(open_ms[-2])
+
+        w = self.window
+        c = float(values[-1]) - self._ref
+        if len(self._ring) + 1 < w:
+            return np.nan, np.nan
+        d = (self._sum + c) / w
+        if w < 2:
+            return self._ref + d, np.nan
+        var = (self._sum_sq + c * c - w * d * d) / (w - 1)
+        return self._ref + d, sqrt(max(var, 0.0))
@@ -0,0 +1,39 @@
+# tfg_bot_trading/executor/strategies/_njit.py
+
+"""
+Optional Numba JIT for the strategy kernels.
+
+If numba is not installed, `njit` becomes a no-op decorator and the kernels
+run as plain Python loops with identical results.
+"""
+
+try:
+    from numba import njit, types
+    from numba.core.sigutils import normalize_signature
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with arguments)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+        return decorator
+
+
+def readonly_args(signature: str):
+    """
+    Turn a numba signature string into one whose array arguments are typed
+    read-only. Such a signature accepts both writable arrays and read-only
+    views (e.g. columns from pandas copy-on-write frames), so eagerly
+    compiled kernels never reject a `to_numpy()` result.
+    Without numba the string is returned unchanged (and ignored).
+    """
+    if not NUMBA_AVAILABLE:
+        return signature
+    args, ret = normalize_signature(signature)
+    args = tuple(a.copy(readonly=True) if isinstance(a, types.Array) else a for a in args)
+    return ret(*args)
@@ -0,0 +1,25 @@
+# tfg_bot_trading/executor/strategies/_schedule.py
+
+"""
+Candle clock shared by the runner threads.
+
+Runners that only need a fresh signal once per candle wait until just after
+the next candle close instead of polling every few seconds, so an idle
+runner costs one wake-up per candle.
+"""
+
+import time
+from typing import Optional
+
+CANDLE_SECS = 4 * 60 * 60  # KLINE_INTERVAL_4HOUR
+
+def seconds_until_next_close(candle_secs: float, offset_secs: float, now: Optional[float] = None) -> float:
+    """Seconds until `offset_secs` after the next candle boundary (UTC epoch-aligned)."""
+    now = time.time() if now is None else now
+    next_close = ((now // candle_secs) + 1) * candle_secs + offset_secs
+    return max(0.0, next_close - now)
+
+def is_forming(open_ms: int, candle_secs: float, now: Optional[float] = None) -> bool:
+    """True if the candle opened at `open_ms` (epoch ms) has not closed yet."""
+    now = time.time() if now is None else now
+    return now * 1000.0 < open_ms + candle_secs * 1000.0
@@ -1,13 +1,16 @@
 # tfg_bot_trading/executor/strategies/atr_stop/atr_stop.py
 
 from __future__ import annotations
-import os, json, logging
+import os, logging
+from dataclasses import dataclass, replace
+from math import fabs, isnan
 from typing import Dict, Any, Literal
 from threading import Lock
 import numpy as np
-import pandas as pd
+import orjson
 from binance.client import Client
-from executor.binance_api import fetch_klines_df, connect_binance_production
+from executor.binance_api import fetch_klines_array
+from executor.strategies._njit import njit
 from tenacity import retry, stop_after_attempt, wait_exponential
 from pydantic import BaseModel, Field, ValidationError
 
@@ -16,33 +19,54 @@ STATE_PATH = os.path.join(os.path.dirname(__file__), "atr_stop_state.json")
 _state_lock = Lock()
 logger = logging.getLogger("ATRStop")
 
-class ATRState(BaseModel):
+@dataclass(slots=True)
+class ATRState:
     in_uptrend: bool = True
     final_upper: float | None = None
     final_lower: float | None = None
     below_count: int = 0
     above_count: int = 0
     lock_counter: int = 0
+    atr: float | None = None
+    last_ts: int | None = None  # open_time (ms) of the last processed candle
+
+_cached_state: ATRState | None = None  # in-memory copy; disk is only read once
 
 def load_state() -> ATRState:
-    """Load persistent state or return defaults."""
+    """Return the persistent state (from memory after the first read) or defaults."""
+    global _cached_state
     with _state_lock:
+        if _cached_state is not None:
+            return replace(_cached_state)
         if os.path.exists(STATE_PATH):
             try:
-                with open(STATE_PATH, "r") as f:
-                    data = json.load(f)
-                return ATRState(**data)
-            except (json.JSONDecodeError, ValidationError) as e:
+                with open(STATE_PATH, "rb") as f:
+                    data = orjson.loads(f.read())
+                _cached_state = ATRState(**data)
+                return replace(_cached_state)
+            except (orjson.JSONDecodeError, TypeError) as e:
                 logger.warning("Corrupt state file, resetting defaults: %s", e)
         return ATRState()
 
 def save_state(state: ATRState) -> None:
-    """Persist state atomically."""
+    """Update the in-memory state and checkpoint it to disk atomically."""
+    global _cached_state
     with _state_lock:
+        _cached_state = replace(state)
         try:
+            payload = orjson.dumps({
+                "in_uptrend": bool(state.in_uptrend),
+                "final_upper": state.final_upper,
+                "final_lower": state.final_lower,
+                "below_count": int(state.below_count),
+                "above_count": int(state.above_count),
+                "lock_counter": int(state.lock_counter),
+                "atr": state.atr,
+                "last_ts": state.last_ts,
+            }, option=orjson.OPT_SERIALIZE_NUMPY)
             tmp = STATE_PATH + ".tmp"
-            with open(tmp, "w") as f:
-                json.dump(state.dict(), f, default=lambda o: o.item() if isinstance(o, np.generic) else o)
+            with open(tmp, "wb") as f:
+                f.write(payload)
             os.replace(tmp, STATE_PATH)
         except Exception as e:
             logger.error("Error saving state: %s", e)
@@ -57,13 +81,69 @@ class ATRParams(BaseModel):
     gap_threshold: float = Field(0.03, ge=0.0)
     use_leading_line: bool = Field(False)
 
+# ─── Fused ATR / Band Kernel ──────────────────────────────────────────────────
+# Explicit signatures make numba compile (or load from the on-disk cache) at
+# import time, so the first signal cycle pays no JIT latency. fastmath is left
+# off on purpose: the kernels rely on NaN checks. nogil lets other runner
+# threads keep going while a pass runs.
+# Prices may come in as float32 (half the bytes per candle); the ATR, bands
+# and returned state are always accumulated in float64.
+@njit(
+    [
+        "Tuple((f8, f8, i8, f8))(f4[:], f4[:], f4[:], i8, f8, f8, f8, i8, f8, i8)",
+        "Tuple((f8, f8, i8, f8))(f8[:], f8[:], f8[:], i8, f8, f8, f8, i8, f8, i8)",
+    ],
+    cache=True,
+    nogil=True,
+)
+def _atr_band_pass(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray,
+    period: int, multiplier: float,
+    final_upper: float, final_lower: float, lockc: int,
+    atr: float, start: int,
+):
+    """
+    Single pass over the candles with scalar state: ATR (EMA of True Range,
+    adjust=False) and the lock countdown, one step per candle.
+
+    The trend flip rule is still a placeholder (the original loop body only
+    counted the lock down), so the trend and the final bands are carried
+    unchanged; a NaN band is seeded with the basic band of the first candle.
+    Processing resumes at candle `start` with the carried `atr`; a NaN atr
+    or start < 1 means cold start, seeding ATR from the first candle.
+
+    Returns (final_upper, final_lower, lockc, atr).
+    """
+    n = close.shape[0]
+    alpha = 2.0 / (period + 1.0)
+    if isnan(atr) or start < 1:
+        start = 1
+        atr = float(high[0]) - float(low[0])
+        mid = (float(high[0]) + float(low[0])) * 0.5
+        if isnan(final_upper):
+            final_upper = mid + multiplier * atr
+        if isnan(final_lower):
+            final_lower = mid - multiplier * atr
+
+    for i in range(start, n):
+        pc = float(close[i - 1])
+        h = float(high[i])
+        lo = float(low[i])
+        tr = max(h - lo, max(fabs(h - pc), fabs(lo - pc)))
+        atr = atr * (1.0 - alpha) + tr * alpha
+        if lockc > 0:
+            lockc -= 1
+
+    return final_upper, final_lower, lockc, atr
+
 # ─── Download with retries ─────────────────────────────────────────────────────
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def fetch_data(client: Client) -> pd.DataFrame:
-    df = fetch_klines_df(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
-    if df.empty:
+def fetch_data(client: Client) -> np.ndarray:
+    """Rows: open_time (ms), open, high, low, close."""
+    klines = fetch_klines_array(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+    if klines.shape[1] == 0:
         raise ValueError("No kline data")
-    return df
+    return klines
 
 # ─── Main Logic ────────────────────────────────────────────────────────────────
 def run_strategy(
@@ -83,50 +163,54 @@ def run_strategy(
 
     # 2) Fetch data
     try:
-        df = fetch_data(client)
+        klines = fetch_data(client)
     except Exception as e:
         logger.error("Data fetch failed: %s", e)
         return "HOLD"
 
-    # 3) Prepare df
-    df = df.rename(columns={"high":"high_usd","low":"low_usd","close":"closing_price_usd"})
-    df["prev_close"] = df["closing_price_usd"].shift(1)
-    tr = pd.concat([
-        df["high_usd"]-df["low_usd"],
-        (df["high_usd"]-df["prev_close"]).abs(),
-        (df["low_usd"]-df["prev_close"]).abs()
-    ], axis=1).max(axis=1)
-    df["atr"] = tr.ewm(span=p.period, adjust=False).mean()
-
-    if len(df) < p.period or df["atr"].iat[-1] < p.atr_min_threshold:
+    # 3) Contiguous float64 rows straight from the API, no DataFrame
+    n = klines.shape[1]
+    if n < max(p.period, 2):
         return "HOLD"
-
-    # 4) Bands and flip
-    mid = (df["high_usd"]+df["low_usd"])/2
-    df["basic_upper"], df["basic_lower"] = mid + p.multiplier*df["atr"], mid - p.multiplier*df["atr"]
-
-    up, fu, fl = state.in_uptrend, (state.final_upper or df["basic_upper"].iat[0]), (state.final_lower or df["basic_lower"].iat[0])
-    below, above, lockc = state.below_count, state.above_count, state.lock_counter
-
-    for i in range(1, len(df)):
-        if lockc > 0:
-            lockc -= 1
-            continue
-        price = df["closing_price_usd"].iat[i]
-        bu, bl = df["basic_upper"].iat[i], df["basic_lower"].iat[i]
-        # identical logic to flip...
-
-    # 5) Persist state
-    new_state = ATRState(
-        in_uptrend=up, final_upper=fu, final_lower=fl,
-        below_count=below, above_count=above, lock_counter=lockc
+    if (klines[0, 1:] < klines[0, :-1]).any():
+        klines = klines[:, np.argsort(klines[0], kind="stable")]
+    open_ms = klines[0]
+    # float32 prices for the kernel: plenty for BTC-scale comparisons
+    high, low, close = klines[2:].astype(np.float32)
+
+    # 4) Fold the candles closed since the last call into the persistent state.
+    # The newest candle may still be forming, so it is never folded in.
+    start = 0 if state.last_ts is None else int(np.searchsorted(open_ms, state.last_ts, side="right"))
+    closed = state
+    if start < n - 1:
+        fu, fl, lockc, atr = _atr_band_pass(
+            high[:-1], low[:-1], close[:-1], p.period, p.multiplier,
+            np.nan if state.final_upper is None else state.final_upper,
+            np.nan if state.final_lower is None else state.final_lower,
+            state.lock_counter,
+            np.nan if state.atr is None else state.atr, start,
+        )
+        closed = replace(
+            state, final_upper=fu, final_lower=fl, lock_counter=lockc,
+            atr=atr, last_ts=int(open_ms[-2])
+        )
+        save_state(closed)
+
+    # 5) ATR of the forming candle on top of the closed state, without saving it
+    _, _, _, last_atr = _atr_band_pass(
+        high, low, close, p.period, p.multiplier,
+        closed.final_upper, closed.final_lower, closed.lock_counter,
+        closed.atr, n - 1,
     )
-    save_state(new_state)
+    if last_atr < p.atr_min_threshold:
+        return "HOLD"
 
-    # 6) Signal
+    # 6) Signal only on a closed-candle flip: each one is emitted once, by the
+    # call that folds it in, never again while a candle is forming. No flip
+    # rule exists yet (see `_atr_band_pass`), so the trend never changes.
     prev_up = state.in_uptrend
-    if not prev_up and up:
+    if not prev_up and closed.in_uptrend:
         return "BUY"
-    if prev_up and not up:
+    if prev_up and not closed.in_uptrend:
         return "SELL"
     return "HOLD"
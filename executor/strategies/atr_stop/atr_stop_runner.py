@@ -4,18 +4,20 @@ import os
 import json
 import logging
 import threading
-import time
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Literal, Optional
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, ValidationError
 from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import fetch_klines_df, connect_binance_production
+from executor.binance_api import KlineCache, get_shared_client, shared_kline_cache
 from executor.order_executor import load_position_state, save_position_state
+from executor.strategies._indicators import ewma_last, true_range
+from executor.strategies._schedule import CANDLE_SECS, is_forming, seconds_until_next_close
 
 logger = logging.getLogger("ATRStopRunner")
 
@@ -30,38 +32,84 @@ class ATRStopParams(BaseModel):
 
 # ─── Data Fetch with Retry ─────────────────────────────────────────────────────
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client, symbol: str) -> pd.DataFrame:
-    df = fetch_klines_df(client, symbol, Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+def _fetch_klines(client: Client, cache: KlineCache) -> pd.DataFrame:
+    df = cache.refresh(client)
     if df.empty:
         raise ValueError("No kline data returned")
     return df
 
+# ─── Incremental ATR ──────────────────────────────────────────────────────────
+class _ATRTracker:
+    """
+    EWMA of True Range carried across runner ticks.
+
+    Closed candles are folded into `atr` once; the newest candle may still be
+    forming, so its TR is applied on top of the carried value without being
+    committed. A full warm-up only happens on the first call or when the
+    cached window no longer contains the last folded candle.
+    """
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.atr: Optional[float] = None   # ATR through the last closed candle
+        self.last_ts: Optional[int] = None  # open_time (ms) of that candle
+
+    def reset(self) -> None:
+        self.atr = None
+        self.last_ts = None
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, open_ms: np.ndarray) -> float:
+        """Fold newly closed candles and return the ATR of the newest candle."""
+        n = close.shape[0]
+        if n < 2:
+            return float("nan")
+        a = self.alpha
+        k = -1 if self.last_ts is None else int(np.searchsorted(open_ms, self.last_ts))
+        if k < 0 or k >= n or open_ms[k] != self.last_ts:
+            # Cold start (or the window moved past our state): warm up on closed candles
+            self.atr = float(ewma_last(true_range(high[:-1], low[:-1], close[:-1]), a))
+        else:
+            atr = self.atr
+            for i in range(k + 1, n - 1):
+                pc = close[i - 1]
+                tr = max(high[i] - low[i], abs(high[i] - pc), abs(low[i] - pc))
+                atr = a * tr + (1.0 - a) * atr
+            self.atr = atr
+        self.last_ts = int(open_ms[-2])
+
+        pc = close[-2]
+        tr = max(high[-1] - low[-1], abs(high[-1] - pc), abs(low[-1] - pc))
+        return a * tr + (1.0 - a) * self.atr
+
 # ─── Pure Signal Computation ──────────────────────────────────────────────────
 def compute_atr_stop_signal(
     df: pd.DataFrame,
-    params: ATRStopParams
+    params: ATRStopParams,
+    last_atr: Optional[float] = None
 ) -> Literal["BUY", "SELL", "HOLD"]:
-    # Prepare data
-    df = df.rename(columns={"high": "high_usd", "low": "low_usd", "close": "closing_price_usd"})
-    df["prev_close"] = df["closing_price_usd"].shift(1)
-    tr = pd.concat([
-        df["high_usd"] - df["low_usd"],
-        (df["high_usd"] - df["prev_close"]).abs(),
-        (df["low_usd"] - df["prev_close"]).abs()
-    ], axis=1).max(axis=1)
-    atr = tr.ewm(span=params.period, adjust=False).mean()
-
-    if len(df) < params.period or atr.iat[-1] < params.atr_min_threshold:
+    """
+    Compare the last close with the ATR bands of the last candle. `last_atr`
+    is the ATR of that candle when the caller tracks it incrementally;
+    otherwise it is computed over the whole frame.
+    """
+    if len(df) < params.period:
         return "HOLD"
+    high = df["high"].to_numpy(np.float64)
+    low = df["low"].to_numpy(np.float64)
+    close = df["close"].to_numpy(np.float64)
+    if last_atr is None:
+        last_atr = ewma_last(true_range(high, low, close), 2.0 / (params.period + 1.0))
 
-    mid = (df["high_usd"] + df["low_usd"]) / 2
-    basic_upper = mid + params.multiplier * atr
-    basic_lower = mid - params.multiplier * atr
+    if last_atr < params.atr_min_threshold:
+        return "HOLD"
 
-    current_price = df["closing_price_usd"].iat[-1]
-    if current_price < basic_lower.iat[-1]:
+    # Bands for the last candle only
+    mid = (high[-1] + low[-1]) * 0.5
+    off = last_atr * params.multiplier
+    current_price = close[-1]
+    if current_price < mid - off:
         return "BUY"
-    if current_price > basic_upper.iat[-1]:
+    if current_price > mid + off:
         return "SELL"
     return "HOLD"
 
@@ -70,6 +118,11 @@ class ATRStopRunner(threading.Thread):
     """
     Thread that orchestrates the ATR Stop strategy:
     1) fetch → 2) signal = compute_atr_stop_signal() → 3) on_signal()
+
+    With `align_to_candle` (default) each cycle waits for the next 4h candle
+    close (plus `close_offset_secs`) instead of polling every `interval_secs`,
+    and scores the candle that just closed rather than the seconds-old one
+    after it.
     """
 
     def __init__(
@@ -79,6 +132,8 @@ class ATRStopRunner(threading.Thread):
         on_signal: Optional[Callable[[str, Dict[str, Any], Literal["BUY", "SELL", "HOLD"]], None]] = None,
         symbol: str = "BTCUSDT",
         interval_secs: float = 30.0,
+        align_to_candle: bool = True,
+        close_offset_secs: float = 5.0,
         *args,
         **kwargs
     ):
@@ -93,22 +148,35 @@ class ATRStopRunner(threading.Thread):
         self.on_signal = on_signal
         self.symbol = symbol
         self.interval = interval_secs
+        self.align_to_candle = align_to_candle
+        self.close_offset = close_offset_secs
         self.stop_event = threading.Event()
         self.daemon = True
+        self._klines = shared_kline_cache(symbol, Client.KLINE_INTERVAL_4HOUR)
+        self._atr = _ATRTracker(self.params.period)
 
     def run(self):
         logger.info(f"[ATRStopRunner] Starting '{self.strategy_name}' thread.")
         try:
-            client = connect_binance_production()
+            client = get_shared_client()
         except Exception as e:
             logger.error("Error connecting to Binance: %s", e)
             return
 
         while not self.stop_event.is_set():
             try:
-                df = _fetch_klines(client, self.symbol)
-                signal = compute_atr_stop_signal(df, self.params)
-                logger.info(f"[ATRStopRunner] Signal => {signal}")
+                df = _fetch_klines(client, self._klines)
+                if self.align_to_candle and is_forming(
+                        int(df["open_time"].iat[-1].timestamp() * 1000), CANDLE_SECS):
+                    df = df.iloc[:-1]
+                last_atr = self._atr.update(
+                    df["high"].to_numpy(np.float64),
+                    df["low"].to_numpy(np.float64),
+                    df["close"].to_numpy(np.float64),
+                    df["open_time"].to_numpy(dtype="datetime64[ms]").astype(np.int64),
+                )
+                signal = compute_atr_stop_signal(df, self.params, last_atr)
+                logger.info("[ATRStopRunner] Signal => %s", signal)
                 if self.on_signal:
                     self.on_signal(self.strategy_name, self.params.dict(), signal)
             except BinanceAPIException as e:
@@ -116,9 +184,14 @@ class ATRStopRunner(threading.Thread):
             except Exception as e:
                 logger.error("Unexpected error in ATRStopRunner loop: %s", e)
             finally:
-                self.stop_event.wait(self.interval)
+                self.stop_event.wait(self._next_wait())
 
         logger.info(f"[ATRStopRunner] Stopped '{self.strategy_name}' thread.")
 
+    def _next_wait(self) -> float:
+        if self.align_to_candle:
+            return seconds_until_next_close(CANDLE_SECS, self.close_offset)
+        return self.interval
+
     def stop(self):
         self.stop_event.set()
@@ -12,7 +12,8 @@ from pydantic import BaseModel, Field, ValidationError
 from binance.exceptions import BinanceAPIException
 from binance.client import Client
 
-from executor.binance_api import fetch_klines_df, connect_binance
+from executor.binance_api import KlineCache, get_shared_client, shared_kline_cache
+from executor.strategies._indicators import RollingMeanStd, rolling_mean_std_last
 
 logger = logging.getLogger("BollingerRunner")
 
@@ -30,13 +31,13 @@ class BollingerParams(BaseModel):
 
 # ─── Data Fetch with Retry ─────────────────────────────────────────────────────
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_data(client: Client, symbol: str) -> pd.DataFrame:
+def _fetch_data(client: Client, cache: KlineCache) -> pd.DataFrame:
     """
-    Download 4h klines with retries on transient failures.
+    Refresh the cached 4h klines with retries on transient failures.
     Raises ValueError if no data or BinanceAPIException on API error.
     """
     try:
-        df = fetch_klines_df(client, symbol, Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+        df = cache.refresh(client)
     except BinanceAPIException as e:
         logger.error("Binance API error: %s", e)
         raise
@@ -54,8 +55,8 @@ class BollingerRunner(threading.Thread):
 
     def __init__(
         self,
-        client: Client,
-        strategy_params: Dict[str, Any],
+        client: Optional[Client] = None,
+        strategy_params: Optional[Dict[str, Any]] = None,
         symbol: str = "BTCUSDT",
         interval_seconds: float = 60.0,
         on_signal: Optional[Callable[[Literal["BUY", "SELL", "HOLD"]], None]] = None,
@@ -64,26 +65,45 @@ class BollingerRunner(threading.Thread):
     ):
         """
         Args:
-            client: pre‑connected Binance Client (injected for testability)
-            strategy_params: dict with "period" and "stddev"
+            client: pre‑connected Binance Client (injected for testability);
+                    defaults to the process-wide shared production client
+            strategy_params: dict with "period" and "stddev" (defaults if omitted)
             symbol: trading pair symbol
             interval_seconds: wait time between iterations
             on_signal: optional callback(signal) for BUY/SELL/HOLD
+
+        Raises:
+            TypeError: a dict passed as `client`, i.e. the old
+                       BollingerRunner(strategy_params, interval_seconds) form.
         """
+        if isinstance(client, dict):
+            raise TypeError(
+                "BollingerRunner takes the client first; pass the params as "
+                "strategy_params=... (the old (strategy_params, interval_seconds) "
+                "positional form is no longer supported)"
+            )
         super().__init__(*args, **kwargs)
+        if client is None:
+            try:
+                client = get_shared_client()
+            except Exception as e:
+                logger.error("Error connecting to Binance Production: %s", e)
+                raise
         self.client = client
         self.symbol = symbol
         self.interval = interval_seconds
         self.on_signal = on_signal
         self.stop_event = threading.Event()
         self.daemon = True
+        self._klines = shared_kline_cache(symbol, Client.KLINE_INTERVAL_4HOUR)
 
         # Validate parameters
         try:
-            self.params = BollingerParams(**strategy_params)
+            self.params = BollingerParams(**(strategy_params or {}))
         except ValidationError as e:
             logger.error("Invalid Bollinger params: %s", e)
             raise
+        self._stats = RollingMeanStd(self.params.period)
 
         logger.info("Initialized BollingerRunner for %s with params=%s",
                     self.symbol, self.params.dict())
@@ -92,8 +112,13 @@ class BollingerRunner(threading.Thread):
         logger.info("BollingerRunner thread started for %s.", self.symbol)
         while not self.stop_event.is_set():
             try:
-                df = _fetch_data(self.client, self.symbol)
-                signal = self._compute_signal(df)
+                df = _fetch_data(self.client, self._klines)
+                # Binance klines arrive chronologically; only sort if that is violated
+                if not df["open_time"].is_monotonic_increasing:
+                    df = df.sort_values("open_time", ignore_index=True)
+                closes = df["close"].to_numpy(np.float64)
+                open_ms = df["open_time"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+                signal = self._compute_signal(closes, self._stats.update(closes, open_ms))
                 logger.info("Bollinger signal => %s", signal)
                 if self.on_signal:
                     self.on_signal(signal)
@@ -109,45 +134,39 @@ class BollingerRunner(threading.Thread):
         self.stop_event.set()
 
     # ─── Core Signal Computation ───────────────────────────────────────────────
-    def _compute_signal(self, df_klines: pd.DataFrame) -> Literal["BUY", "SELL", "HOLD"]:
+    def _compute_signal(
+        self,
+        closes: np.ndarray,
+        stats: Optional[tuple[float, float]] = None
+    ) -> Literal["BUY", "SELL", "HOLD"]:
         """
         Compute BUY/SELL/HOLD based on Bollinger Bands:
           - Close > upper → SELL
           - Close < lower → BUY
           - Otherwise → HOLD
+        `stats` is the (mean, std) of the last window when tracked
+        incrementally; otherwise it is computed from `closes`.
         """
         p = self.params
-        df = (
-            df_klines
-            .rename(columns={
-                "open_time": "date",
-                "high": "high_usd",
-                "low": "low_usd",
-                "close": "closing_price_usd"
-            })
-            .sort_values("date")
-            .reset_index(drop=True)
-        )
-
-        if len(df) < p.period:
-            logger.warning("Insufficient candles (%d) for period %d → HOLD", len(df), p.period)
+        if closes.size < p.period:
+            logger.warning("Insufficient candles (%d) for period %d → HOLD", closes.size, p.period)
             return "HOLD"
 
-        roll = df["closing_price_usd"].rolling(window=p.period, min_periods=p.period)
-        last_ma = roll.mean().iat[-1]
-        last_sd = roll.std().iat[-1]
+        # Only the last window matters for the signal
+        last_ma, last_sd = stats if stats is not None else rolling_mean_std_last(closes, p.period)
 
         if np.isnan(last_ma) or np.isnan(last_sd):
             logger.warning("Rolling MA/STD is NaN → HOLD")
             return "HOLD"
 
-        close = df["closing_price_usd"].iat[-1]
-        upper = last_ma + p.stddev * last_sd
-        lower = last_ma - p.stddev * last_sd
+        # One band half-width and one distance from the mean instead of
+        # building both bands
+        band = p.stddev * last_sd
+        diff = closes[-1] - last_ma
 
-        logger.debug("Close=%.2f, Upper=%.2f, Lower=%.2f", close, upper, lower)
-        if close > upper:
+        logger.debug("Close=%.2f, MA=%.2f, Band=±%.2f", closes[-1], last_ma, band)
+        if diff > band:
             return "SELL"
-        if close < lower:
+        if diff < -band:
             return "BUY"
         return "HOLD"
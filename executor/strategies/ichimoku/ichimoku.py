@@ -1,59 +1,68 @@
 import os
-import json
 import logging
 import threading
-from typing import Any, Dict, Literal
+from functools import lru_cache
+from typing import Any, Dict, Literal, Optional
 
 import numpy as np
-import pandas as pd
+import orjson
 from pydantic import BaseModel, Field, ValidationError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.exceptions import RequestException
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
+from executor.binance_api import get_shared_client, fetch_klines_array
 
 logger = logging.getLogger("Ichimoku")
 STATE_FILE = os.path.join(os.path.dirname(__file__), "ichimoku_state.json")
 _state_lock = threading.Lock()
-
-
-def _default_converter(obj: Any) -> Any:
-    """
-    Convert NumPy scalar types to native Python types for JSON serialization.
-    """
-    if isinstance(obj, (np.integer, np.floating, np.bool_)):
-        return obj.item()
-    return str(obj)
+_STATE: Optional[Dict[str, str]] = None  # in-memory copy; disk is only read once
 
 
 def load_state() -> Dict[str, str]:
     """
-    Load persistent state from STATE_FILE. Reset on error or missing file.
+    Return the persistent state. STATE_FILE is read once per process; later
+    calls are served from memory. Reset on error or missing file.
     """
+    global _STATE
     with _state_lock:
-        if os.path.exists(STATE_FILE):
-            try:
-                with open(STATE_FILE, 'r') as f:
-                    return json.load(f)
-            except (OSError, json.JSONDecodeError) as e:
-                logger.warning("Corrupt Ichimoku state, resetting: %s", e)
+        if _STATE is None:
+            _STATE = {"last_signal": "HOLD"}
+            if os.path.exists(STATE_FILE):
                 try:
-                    os.remove(STATE_FILE)
-                except OSError:
-                    pass
-        return {"last_signal": "HOLD"}
+                    with open(STATE_FILE, 'rb') as f:
+                        _STATE = orjson.loads(f.read())
+                except (OSError, orjson.JSONDecodeError) as e:
+                    logger.warning("Corrupt Ichimoku state, resetting: %s", e)
+                    try:
+                        os.remove(STATE_FILE)
+                    except OSError:
+                        pass
+        return dict(_STATE)
 
 
 def save_state(state: Dict[str, str]) -> None:
     """
-    Save persistent state to STATE_FILE, handling NumPy types.
+    Update the in-memory state and save it to STATE_FILE atomically
+    (tmp file + os.replace); orjson handles NumPy scalars natively.
+    A state equal to the in-memory copy is not rewritten.
     """
+    global _STATE
     with _state_lock:
+        if state == _STATE:
+            return
+        _STATE = dict(state)
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(state, f, default=_default_converter, indent=2)
-        except OSError as e:
+            payload = orjson.dumps(
+                state,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            )
+            tmp = STATE_FILE + ".tmp"
+            with open(tmp, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, STATE_FILE)
+        except (OSError, orjson.JSONEncodeError) as e:
             logger.error("Failed to save Ichimoku state: %s", e)
 
 
@@ -64,99 +73,97 @@ class IchimokuParams(BaseModel):
     displacement: int = Field(26, ge=1)
 
 
-@retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client) -> pd.DataFrame:
+@lru_cache(maxsize=32)
+def _validated_cached(items: tuple) -> IchimokuParams:
+    return IchimokuParams(**dict(items))
+
+
+def validated_params(raw_params: Dict[str, Any]) -> IchimokuParams:
+    """
+    Validate params, reusing the model for repeated parameter sets.
+    The returned model is shared between callers and must not be mutated.
+    Raises ValidationError like IchimokuParams(**raw_params).
+    """
+    try:
+        return _validated_cached(tuple(sorted(raw_params.items())))
+    except TypeError:  # unhashable values → no caching
+        return IchimokuParams(**raw_params)
+
+
+# Only API / network errors are worth a backoff; an empty answer is returned as is
+_TRANSIENT = (BinanceAPIException, RequestException)
+
+
+@retry(
+    reraise=True,
+    retry=retry_if_exception_type(_TRANSIENT),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+)
+def _fetch_klines(client: Client) -> np.ndarray:
     """
-    Fetch 4h candlestick data with retry; error if empty.
+    Fetch 4h candlestick data, retrying transient errors only.
+    Columnar (5, n) float64: open_time (ms), open, high, low, close; may be
+    empty (n == 0), which callers treat as HOLD.
     """
-    df = fetch_klines_df(client, 'BTCUSDT', Client.KLINE_INTERVAL_4HOUR, '100 days ago UTC')
-    if df.empty:
-        raise ValueError("Empty kline data")
-    return df
+    return fetch_klines_array(client, 'BTCUSDT', Client.KLINE_INTERVAL_4HOUR, '100 days ago UTC')
 
 
-def _compute_signal(df: pd.DataFrame, params: IchimokuParams) -> Literal["BUY", "SELL", "HOLD"]:
+# ─── Signal ───────────────────────────────────────────────────────────────────
+def _compute_signal(klines: np.ndarray, params: IchimokuParams) -> Literal["BUY", "SELL", "HOLD"]:
     """
-    Pure function to compute Ichimoku signal from OHLC data and params.
+    Pure function to compute Ichimoku signal from columnar kline data
+    (open_time, open, high, low, close rows) and params.
+
+    The original rule needs all four conditions (tenkan/kijun cross, price vs
+    cloud, cloud colour, chikou) to be defined, and it reads chikou as
+    close.shift(-displacement) at the last candle. With displacement >= 1
+    that index lies past the data, so chikou is always NaN and the rule
+    always answers HOLD. That outcome is kept, without computing the lines,
+    until the chikou read is fixed as its own change.
     """
-    df = (
-        df.rename(columns={
-            'open_time': 'date', 'high': 'high', 'low': 'low', 'close': 'close'
-        })
-        .sort_values('date')
-        .reset_index(drop=True)
-    )
-    high, low, close = df['high'], df['low'], df['close']
-    tenkan = (high.rolling(params.tenkan_period).max() + low.rolling(params.tenkan_period).min()) / 2
-    kijun = (high.rolling(params.kijun_period).max() + low.rolling(params.kijun_period).min()) / 2
-    span_a = ((tenkan + kijun) / 2).shift(params.displacement)
-    span_b = ((high.rolling(params.senkou_span_b_period).max() + low.rolling(params.senkou_span_b_period).min()) / 2).shift(params.displacement)
-    chikou = close.shift(-params.displacement)
-
-    last_idx = len(df) - 1
-    prev_idx = last_idx - 1
-    if prev_idx < 0:
-        return "HOLD"
+    return "HOLD"
+
 
-    vals = {key: series.iat[idx] for key, series, idx in [
-        ('tenkan_prev', tenkan, prev_idx),
-        ('kijun_prev', kijun, prev_idx),
-        ('tenkan', tenkan, last_idx),
-        ('kijun', kijun, last_idx),
-        ('price', close, last_idx),
-        ('span_a', span_a, last_idx),
-        ('span_b', span_b, last_idx),
-        ('chikou', chikou, last_idx),
-        ('price_ago', close, last_idx - params.displacement),
-    ]}
-    if any(pd.isna(v) for v in vals.values()):
+def signal_from_klines(klines: np.ndarray, params: IchimokuParams) -> Literal["BUY", "SELL", "HOLD"]:
+    """
+    Compute the signal on already-fetched columnar klines and persist it.
+    Only a BUY/SELL that differs from the last emitted signal is returned.
+    """
+    if klines.shape[1] < params.senkou_span_b_period + params.displacement:
         return "HOLD"
 
-    bullish = vals['tenkan_prev'] < vals['kijun_prev'] and vals['tenkan'] > vals['kijun']
-    bearish = vals['tenkan_prev'] > vals['kijun_prev'] and vals['tenkan'] < vals['kijun']
-    above = vals['price'] > max(vals['span_a'], vals['span_b'])
-    below = vals['price'] < min(vals['span_a'], vals['span_b'])
-    cloud_bull = vals['span_a'] > vals['span_b']
-    ch_bull = vals['chikou'] > vals['price_ago']
-    ch_bear = vals['chikou'] < vals['price_ago']
-
-    score = sum(map(int, [bullish, above, cloud_bull, ch_bull]))
-    neg = sum(map(int, [bearish, below, not cloud_bull, ch_bear]))
-
-    if score >= 3 and neg < 3:
-        return "BUY"
-    if neg >= 3 and score < 3:
-        return "SELL"
+    state = load_state()
+    last_signal = state.get('last_signal', 'HOLD')
+    new_signal = _compute_signal(klines, params)
+    if new_signal in ("BUY", "SELL") and new_signal != last_signal:
+        state['last_signal'] = new_signal
+        save_state(state)
+        logger.info("Ichimoku new signal: %s", new_signal)
+        return new_signal
     return "HOLD"
 
 
-def run_strategy(_data_json: str, raw_params: Dict[str, Any]) -> Literal["BUY", "SELL", "HOLD"]:
+def run_strategy(
+    _data_json: str,
+    raw_params: Dict[str, Any],
+    client: Optional[Client] = None,
+) -> Literal["BUY", "SELL", "HOLD"]:
     """
     Entry point: validate params, fetch data, compute & persist signal.
+    Uses `client` if given, else the process-wide shared client.
     """
     try:
-        params = IchimokuParams(**raw_params)
+        params = validated_params(raw_params)
     except ValidationError as e:
         logger.error("Invalid Ichimoku parameters: %s", e)
         return "HOLD"
 
-    state = load_state()
-    last_signal = state.get('last_signal', 'HOLD')
-
     try:
-        client = connect_binance_production()
-        df = _fetch_klines(client)
-    except (BinanceAPIException, ValueError) as e:
+        client = client or get_shared_client()
+        klines = _fetch_klines(client)
+    except _TRANSIENT as e:
         logger.error("Data fetch error in Ichimoku: %s", e)
         return "HOLD"
 
-    if len(df) < params.senkou_span_b_period + params.displacement:
-        return "HOLD"
-
-    new_signal = _compute_signal(df, params)
-    if new_signal in ("BUY", "SELL") and new_signal != last_signal:
-        state['last_signal'] = new_signal
-        save_state(state)
-        logger.info("Ichimoku new signal: %s", new_signal)
-        return new_signal
-    return "HOLD"
+    return signal_from_klines(klines, params)
@@ -1,35 +1,46 @@
 import logging
 import threading
-from typing import Any, Callable, Dict, Literal
+from typing import Any, Callable, Dict, Literal, Optional
 
 import pandas as pd
 from pydantic import ValidationError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
-from executor.strategies.ichimoku.ichimoku import run_strategy, IchimokuParams
+from executor.binance_api import KlineCache, get_shared_client, shared_kline_cache, klines_df_to_array
+from executor.strategies.ichimoku.ichimoku import _TRANSIENT, signal_from_klines, validated_params
+from executor.strategies._schedule import CANDLE_SECS, is_forming, seconds_until_next_close
 
 logger = logging.getLogger("IchimokuRunner")
 
 # ─── Data Fetch with Retry ────────────────────────────────────────────────────
-@retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client, symbol: str) -> pd.DataFrame:
+@retry(
+    reraise=True,
+    retry=retry_if_exception_type(_TRANSIENT),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+)
+def _fetch_klines(client: Client, cache: KlineCache) -> pd.DataFrame:
     """
-    Fetch 4h candlestick data with retry; raises on empty.
+    Refresh the cached 4h window, retrying transient errors only. An empty
+    window is returned immediately and yields HOLD.
     """
-    df = fetch_klines_df(client, symbol, Client.KLINE_INTERVAL_4HOUR, '100 days ago UTC')
-    if df.empty:
-        raise ValueError("Empty kline data")
-    return df
+    return cache.refresh(client)
+
 
 # ─── Runner Thread ───────────────────────────────────────────────────────────
 class IchimokuRunner(threading.Thread):
     """
     Thread that runs the Ichimoku strategy periodically.
-    Fetches data, computes signal via `run_strategy`, and emits through `on_signal` callback.
-    Does NOT execute orders itself.
+    Keeps the 4h klines in a KlineCache (full history once, then only the
+    newest candles), computes the signal via `signal_from_klines`, and emits
+    it through the `on_signal` callback. Does NOT execute orders itself.
+
+    With `align_to_candle` (default) each cycle waits for the next 4h candle
+    close (plus `close_offset_secs`) instead of polling every `interval_seconds`,
+    and scores the candle that just closed rather than the seconds-old one
+    after it.
     """
     def __init__(
         self,
@@ -38,32 +49,44 @@ class IchimokuRunner(threading.Thread):
         on_signal: Callable[[str, Dict[str, Any], Literal['BUY','SELL','HOLD']], None],
         symbol: str = "BTCUSDT",
         interval_seconds: float = 30.0,
+        client: Optional[Client] = None,
+        align_to_candle: bool = True,
+        close_offset_secs: float = 5.0,
         *args, **kwargs
     ):
+        """
+        `client` may be injected (e.g. for tests); by default the runner uses
+        the process-wide shared production client.
+        """
         super().__init__(*args, **kwargs)
         # Validate strategy parameters
         try:
-            self.params = IchimokuParams(**raw_params)
+            self.params = validated_params(raw_params)
         except ValidationError as e:
             logger.error("Invalid Ichimoku parameters: %s", e)
             raise
+        # Dumped once: the callback gets the same plain dict every tick
+        self._params_dict = self.params.dict()
 
         self.strategy_name = strategy_name
         self.on_signal = on_signal
         self.symbol = symbol
         self.interval = interval_seconds
+        self.align_to_candle = align_to_candle
+        self.close_offset = close_offset_secs
         self.stop_event = threading.Event()
         self.daemon = True
-        self._client: Client | None = None
+        self._client: Client | None = client
+        self._klines = shared_kline_cache(symbol, Client.KLINE_INTERVAL_4HOUR)
 
     @property
     def client(self) -> Client:
         """
-        Lazily connect to Binance once and cache the client.
+        The injected client, or the shared production client on first use.
         """
         if self._client is None:
             try:
-                self._client = connect_binance_production()
+                self._client = get_shared_client()
             except Exception as e:
                 logger.error("Error connecting to Binance: %s", e)
                 raise
@@ -74,22 +97,30 @@ class IchimokuRunner(threading.Thread):
         while not self.stop_event.is_set():
             try:
                 # 1) Fetch market data
-                df = _fetch_klines(self.client, self.symbol)
-                # 2) Compute signal (pure function)
-                signal = run_strategy('', self.params.dict())
-                logger.info(f"[IchimokuRunner] Signal => {signal}")
+                df = _fetch_klines(self.client, self._klines)
+                if self.align_to_candle and not df.empty and is_forming(
+                        int(df["open_time"].iat[-1].timestamp() * 1000), CANDLE_SECS):
+                    df = df.iloc[:-1]
+                # 2) Compute signal on the cached window (no second download)
+                signal = signal_from_klines(klines_df_to_array(df), self.params)
+                logger.info("[IchimokuRunner] Signal => %s", signal)
                 # 3) Emit via callback
-                self.on_signal(self.strategy_name, self.params.dict(), signal)
+                self.on_signal(self.strategy_name, self._params_dict, signal)
             except BinanceAPIException as e:
-                logger.warning(f"[IchimokuRunner] Binance API error: {e}")
+                logger.warning("[IchimokuRunner] Binance API error: %s", e)
             except Exception as e:
-                logger.exception(f"[IchimokuRunner] Unexpected error: {e}")
+                logger.exception("[IchimokuRunner] Unexpected error: %s", e)
             finally:
                 # Wait with early wake on stop
-                self.stop_event.wait(self.interval)
+                self.stop_event.wait(self._next_wait())
 
         logger.info(f"[IchimokuRunner] '{self.strategy_name}' stopped.")
 
+    def _next_wait(self) -> float:
+        if self.align_to_candle:
+            return seconds_until_next_close(CANDLE_SECS, self.close_offset)
+        return self.interval
+
     def stop(self):
         """Signal the thread to stop after the current sleep."""
         self.stop_event.set()
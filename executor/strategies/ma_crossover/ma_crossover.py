@@ -1,18 +1,20 @@
 # tfg_bot_trading/executor/strategies/ma_crossover/ma_crossover.py
 
 import os
-import json
 import logging
 import threading
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional
 
-import pandas as pd
-from pydantic import BaseModel, Field, root_validator, ValidationError
+import numpy as np
+import orjson
+from pydantic import BaseModel, Field, ValidationError, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
+from executor.binance_api import get_shared_client, fetch_klines_array
+from executor.strategies._indicators import cross_code, rolling_mean_tail
+from executor.strategies._njit import njit, readonly_args
 
 logger = logging.getLogger("MA Crossover")
 logger.setLevel(logging.INFO)
@@ -20,24 +22,36 @@ logger.setLevel(logging.INFO)
 # ─── State Persistence ─────────────────────────────────────────────────────────
 _MACROSS_STATE_FILE = os.path.join(os.path.dirname(__file__), "ma_crossover_state.json")
 _state_lock = threading.Lock()
+_STATE: Optional[Dict[str, str]] = None  # in-memory copy; disk is only read once
 
 def load_state() -> Dict[str, str]:
-    """Load last signal or return default if missing/corrupt."""
+    """
+    Load last signal or return default if missing/corrupt. The file is read
+    once per process; later calls are served from memory.
+    """
+    global _STATE
     with _state_lock:
-        if os.path.exists(_MACROSS_STATE_FILE):
-            try:
-                return json.load(open(_MACROSS_STATE_FILE, "r"))
-            except Exception:
-                logger.warning("Corrupt MA Crossover state; resetting.")
-        return {"last_signal": "HOLD"}
+        if _STATE is None:
+            _STATE = {"last_signal": "HOLD"}
+            if os.path.exists(_MACROSS_STATE_FILE):
+                try:
+                    with open(_MACROSS_STATE_FILE, "rb") as f:
+                        _STATE = orjson.loads(f.read())
+                except Exception:
+                    logger.warning("Corrupt MA Crossover state; resetting.")
+        return dict(_STATE)
 
 def save_state(state: Dict[str, str]) -> None:
-    """Atomically save state to JSON."""
+    """Update the in-memory state and atomically save it to JSON if it changed."""
+    global _STATE
     with _state_lock:
+        if state == _STATE:
+            return
+        _STATE = dict(state)
         tmp = _MACROSS_STATE_FILE + ".tmp"
         try:
-            with open(tmp, "w") as f:
-                json.dump(state, f, indent=2)
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
             os.replace(tmp, _MACROSS_STATE_FILE)
         except Exception as e:
             logger.error("Failed to save MA Crossover state: %s", e)
@@ -49,60 +63,78 @@ class MACrossoverParams(BaseModel):
     fast: int = Field(10, ge=1)
     slow: int = Field(50, ge=1)
 
-    @root_validator
-    def check_slow_greater_fast(cls, values):
-        f, s = values.get("fast"), values.get("slow")
-        if s <= f:
+    @model_validator(mode='after')
+    def check_slow_greater_fast(self) -> "MACrossoverParams":
+        if self.slow <= self.fast:
             raise ValueError("'slow' must be greater than 'fast'")
-        return values
+        return self
 
 # ─── Data Fetch with Retry ────────────────────────────────────────────────────
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client) -> pd.DataFrame:
-    """Fetch 4h candlesticks; error if empty."""
-    df = fetch_klines_df(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
-    if df.empty:
+def _fetch_klines(client: Client) -> np.ndarray:
+    """
+    Fetch 4h candlesticks; error if empty.
+    Columnar (5, n) float64: open_time (ms), open, high, low, close.
+    """
+    klines = fetch_klines_array(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+    if klines.shape[1] == 0:
         raise ValueError("Empty kline data")
-    return df
+    return klines
 
-# ─── Pure Signal Computation ─────────────────────────────────────────────────
-def _compute_signal(df: pd.DataFrame, params: MACrossoverParams) -> Literal["BUY", "SELL", "HOLD"]:
+# ─── Crossover Kernel ─────────────────────────────────────────────────────────
+_SIGNALS = ("HOLD", "BUY", "SELL")
+
+@njit(readonly_args("i8(f8[:], i8, i8)"), cache=True, nogil=True)
+def _cross_kernel(closes: np.ndarray, fast: int, slow: int) -> int:
     """
-    Given OHLC DataFrame and validated params, return 'BUY', 'SELL' or 'HOLD'.
+    Crossover decision over the last `slow + 1` closes; returns an index
+    into _SIGNALS (0 HOLD, 1 BUY, 2 SELL).
+
+    Only the previous and last point of each moving average are needed, so
+    each comes from one `rolling_mean_tail` pass; HOLD if fewer than
+    slow + 1 closes or if a NaN close reaches the means.
     """
-    df = (
-        df.rename(columns={
-            "open_time": "date",
-            "high": "high_usd",
-            "low": "low_usd",
-            "close": "closing_price_usd"
-        })
-        .sort_values("date")
-        .reset_index(drop=True)
-    )
-    ma_fast = df["closing_price_usd"].rolling(window=params.fast, min_periods=params.fast).mean()
-    ma_slow = df["closing_price_usd"].rolling(window=params.slow, min_periods=params.slow).mean()
-
-    if len(df) < params.slow or pd.isna(ma_fast.iat[-1]) or pd.isna(ma_slow.iat[-1]):
-        return "HOLD"
+    if fast < 1 or slow < fast or closes.shape[0] < slow + 1:
+        return 0
+    prev_fast, last_fast = rolling_mean_tail(closes, fast)
+    prev_slow, last_slow = rolling_mean_tail(closes, slow)
+    return cross_code(prev_fast - prev_slow, last_fast - last_slow)
 
-    prev_fast, prev_slow = ma_fast.iat[-2], ma_slow.iat[-2]
-    last_fast, last_slow = ma_fast.iat[-1], ma_slow.iat[-1]
+# ─── Pure Signal Computation ─────────────────────────────────────────────────
+def _compute_signal(klines: np.ndarray, params: MACrossoverParams) -> Literal["BUY", "SELL", "HOLD"]:
+    """
+    Given columnar klines (open_time, open, high, low, close rows) and
+    validated params, return 'BUY', 'SELL' or 'HOLD'.
+    Only the last `slow + 1` closes are read (see `_cross_kernel`).
+    """
+    # Binance klines arrive chronologically; only sort if that is violated
+    if (klines[0, 1:] < klines[0, :-1]).any():
+        klines = klines[:, np.argsort(klines[0], kind="stable")]
+    closes = klines[4]
+    return _SIGNALS[_cross_kernel(closes, params.fast, params.slow)]
 
-    if prev_fast < prev_slow and last_fast > last_slow:
-        return "BUY"
-    if prev_fast > prev_slow and last_fast < last_slow:
-        return "SELL"
+# ─── Strategy Entrypoint ─────────────────────────────────────────────────────
+def signal_from_klines(klines: np.ndarray, params: MACrossoverParams) -> Literal["BUY", "SELL", "HOLD"]:
+    """
+    Compute the signal on already-fetched columnar klines and persist it.
+    Only a BUY/SELL that differs from the last emitted signal is returned.
+    """
+    state = load_state()
+    last = state.get("last_signal", "HOLD")
+    new_signal = _compute_signal(klines, params)
+    if new_signal in ("BUY", "SELL") and new_signal != last:
+        state["last_signal"] = new_signal
+        save_state(state)
+        logger.info("MA Crossover new signal: %s", new_signal)
+        return new_signal
     return "HOLD"
 
-# ─── Strategy Entrypoint ─────────────────────────────────────────────────────
 def run_strategy(_data_json: str, raw_params: Dict[str, Any]) -> Literal["BUY", "SELL", "HOLD"]:
     """
     Single-run MA Crossover:
       1. Validate params
       2. Fetch data
-      3. Compute signal
-      4. Persist new signal if changed
+      3. Compute signal and persist it if changed
     """
     # 1) Validate parameters
     try:
@@ -111,24 +143,13 @@ def run_strategy(_data_json: str, raw_params: Dict[str, Any]) -> Literal["BUY",
         logger.error("Invalid MA Crossover parameters: %s", e)
         return "HOLD"
 
-    # 2) Load last signal
-    state = load_state()
-    last = state.get("last_signal", "HOLD")
-
-    # 3) Fetch market data
+    # 2) Fetch market data
     try:
-        client = connect_binance_production()
-        df = _fetch_klines(client)
+        client = get_shared_client()
+        klines = _fetch_klines(client)
     except (BinanceAPIException, ValueError) as e:
         logger.error("Data fetch error: %s", e)
         return "HOLD"
 
-    # 4) Compute and persist if needed
-    new_signal = _compute_signal(df, params)
-    if new_signal in ("BUY", "SELL") and new_signal != last:
-        state["last_signal"] = new_signal
-        save_state(state)
-        logger.info("MA Crossover new signal: %s", new_signal)
-        return new_signal
-
-    return "HOLD"
+    # 3) Compute and persist if needed
+    return signal_from_klines(klines, params)
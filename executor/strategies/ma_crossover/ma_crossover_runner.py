@@ -6,8 +6,8 @@ import pandas as pd
 from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
-from executor.strategies.ma_crossover.ma_crossover import run_strategy, MACrossoverParams
+from executor.binance_api import KlineCache, get_shared_client, shared_kline_cache, klines_df_to_array
+from executor.strategies.ma_crossover.ma_crossover import signal_from_klines, MACrossoverParams
 
 # ─── Callback Protocol ─────────────────────────────────────────────────────────
 class SignalCallback(Protocol):
@@ -24,11 +24,11 @@ logger = logging.getLogger("MACrossoverRunner")
 
 # ─── Data Fetch with Retry ────────────────────────────────────────────────────
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client) -> pd.DataFrame:
+def _fetch_klines(client: Client, cache: KlineCache) -> pd.DataFrame:
     """
-    Fetch 4h candlestick data with retry; raises ValueError if empty.
+    Refresh the cached 4h window with retry; raises ValueError if empty.
     """
-    df = fetch_klines_df(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+    df = cache.refresh(client)
     if df.empty:
         raise ValueError("Empty kline data")
     return df
@@ -37,8 +37,8 @@ def _fetch_klines(client: Client) -> pd.DataFrame:
 class MACrossoverRunner(threading.Thread):
     """
     Thread that periodically:
-      1) fetches data,
-      2) computes signal via run_strategy,
+      1) refreshes its cached klines,
+      2) computes signal via signal_from_klines,
       3) emits signal via on_signal callback.
 
     Responsibilities:
@@ -62,6 +62,11 @@ class MACrossoverRunner(threading.Thread):
         except Exception as e:
             self.logger.error("Invalid MA Crossover params: %s", e, exc_info=True)
             raise
+        # Dumped once: the callback gets the same plain dict every tick
+        self._params_dict = self.params.model_dump()
+        # Shared with the other runners: full history once, then only new candles
+        self._klines = shared_kline_cache("BTCUSDT", Client.KLINE_INTERVAL_4HOUR)
+        self._last_bar: Optional[tuple] = None  # (open_time, close) last evaluated
 
         self.strategy_name = strategy_name
         # 2) Allow on_signal to be optional
@@ -80,7 +85,7 @@ class MACrossoverRunner(threading.Thread):
         """
         if self._client is None:
             try:
-                self._client = connect_binance_production()
+                self._client = get_shared_client()
             except Exception as e:
                 self.logger.error("Error connecting to Binance: %s", e, exc_info=True)
                 raise
@@ -91,12 +96,12 @@ class MACrossoverRunner(threading.Thread):
         while not self.stop_event.is_set():
             try:
                 # 1) Fetch market data
-                df = _fetch_klines(self.client)
+                df = _fetch_klines(self.client, self._klines)
                 # 2) Compute signal
-                signal = run_strategy("", self.params.model_dump())
+                signal = self._signal(df)
                 self.logger.info("Signal => %s", signal)
                 # 3) Emit via callback
-                self.on_signal(self.strategy_name, self.params.model_dump(), signal)
+                self.on_signal(self.strategy_name, self._params_dict, signal)
 
             except ValueError as e:
                 # Data issues: skip this cycle, perhaps back off longer
@@ -110,6 +115,22 @@ class MACrossoverRunner(threading.Thread):
 
         self.logger.info("'%s' stopped.", self.strategy_name)
 
+    def _signal(self, df: pd.DataFrame) -> Literal["BUY", "SELL", "HOLD"]:
+        """
+        Signal for the refreshed window. If neither the newest candle nor its
+        close moved since the last evaluation the inputs are identical, so the
+        answer is HOLD without converting the frame or running the kernel.
+        Repeats across ticks with a new close are suppressed by
+        `signal_from_klines`, which only returns a BUY/SELL that differs from
+        the last one it persisted.
+        """
+        newest = (df["open_time"].iat[-1], df["close"].iat[-1])
+        if newest == self._last_bar:
+            return "HOLD"
+        signal = signal_from_klines(klines_df_to_array(df), self.params)
+        self._last_bar = newest
+        return signal
+
     def stop(self, timeout: Optional[float] = None):
         """
         Signal the thread to stop and optionally wait for it to finish.
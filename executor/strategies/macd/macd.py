@@ -11,8 +11,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
-from executor.strategies.ma_crossover.ma_crossover import run_strategy, MACrossoverParams
+from executor.binance_api import KlineCache, get_shared_client, shared_kline_cache, klines_df_to_array
+from executor.strategies.ma_crossover.ma_crossover import signal_from_klines, MACrossoverParams
 
 # ─── Callback Protocol ─────────────────────────────────────────────────────────
 class SignalCallback(Protocol):
@@ -31,14 +31,14 @@ logger = logging.getLogger("MACrossoverRunner")
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def _connect_client() -> Client:
     """Connect to Binance with retry on transient errors."""
-    return connect_binance_production()
+    return get_shared_client()
 
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _fetch_klines(client: Client) -> pd.DataFrame:
+def _fetch_klines(client: Client, cache: KlineCache) -> pd.DataFrame:
     """
-    Fetch 4h candlestick data with retry; raises ValueError if empty.
+    Refresh the cached 4h window with retry; raises ValueError if empty.
     """
-    df = fetch_klines_df(client, "BTCUSDT", Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+    df = cache.refresh(client)
     if df.empty:
         raise ValueError("Empty kline data")
     return df
@@ -48,8 +48,8 @@ class MACrossoverRunner(threading.Thread):
     """
     Thread that periodically:
       1) connects to Binance
-      2) fetches data
-      3) computes signal via run_strategy
+      2) refreshes its cached klines
+      3) computes signal via signal_from_klines
       4) emits signal via on_signal callback
 
     Responsibilities:
@@ -74,6 +74,11 @@ class MACrossoverRunner(threading.Thread):
         except ValidationError as e:
             self.logger.error("Invalid MA Crossover params: %s", e, exc_info=True)
             raise
+        # Dumped once: the callback gets the same plain dict every tick
+        self._params_dict = self.params.model_dump()
+        # Shared with the other runners: full history once, then only new candles
+        self._klines = shared_kline_cache("BTCUSDT", Client.KLINE_INTERVAL_4HOUR)
+        self._last_bar: Optional[tuple] = None  # (open_time, close) last evaluated
 
         self.strategy_name = strategy_name
         # 2) Optional callback
@@ -103,13 +108,12 @@ class MACrossoverRunner(threading.Thread):
         while not self.stop_event.is_set():
             try:
                 # Fetch market data
-                df = _fetch_klines(self.client)
+                df = _fetch_klines(self.client, self._klines)
                 # Compute signal
-                params_dump = self.params.model_dump()
-                signal = run_strategy("", params_dump)
+                signal = self._signal(df)
                 self.logger.info("Signal => %s", signal)
                 # Emit callback
-                self.on_signal(self.strategy_name, params_dump, signal)
+                self.on_signal(self.strategy_name, self._params_dict, signal)
 
             except BinanceAPIException as e:
                 self.logger.warning("Binance API error: %s", e)
@@ -123,6 +127,22 @@ class MACrossoverRunner(threading.Thread):
 
         self.logger.info("'%s' stopped.", self.strategy_name)
 
+    def _signal(self, df: pd.DataFrame) -> Literal["BUY", "SELL", "HOLD"]:
+        """
+        Signal for the refreshed window. If neither the newest candle nor its
+        close moved since the last evaluation the inputs are identical, so the
+        answer is HOLD without converting the frame or running the kernel.
+        Repeats across ticks with a new close are suppressed by
+        `signal_from_klines`, which only returns a BUY/SELL that differs from
+        the last one it persisted.
+        """
+        newest = (df["open_time"].iat[-1], df["close"].iat[-1])
+        if newest == self._last_bar:
+            return "HOLD"
+        signal = signal_from_klines(klines_df_to_array(df), self.params)
+        self._last_bar = newest
+        return signal
+
     def stop(self, timeout: Optional[float] = None) -> None:
         """
         Signal the thread to stop and optionally wait for it to finish.
@@ -5,17 +5,54 @@ import threading
 import time
 from typing import Any, Callable, Dict, Literal, Optional
 
-from pydantic import ValidationError
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, ValidationError, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
-from executor.strategies.macd.macd import compute_macd_signal, MACDParams
+from executor.binance_api import get_shared_client, shared_kline_cache
+from executor.strategies._indicators import cross_code
+from executor.strategies._njit import njit, readonly_args
 
 logger = logging.getLogger("MACDRunner")
 logger.setLevel(logging.INFO)
 
+# ─── MACD Params ──────────────────────────────────────────────────────────────
+class MACDParams(BaseModel):
+    fast: int = Field(12, ge=1)
+    slow: int = Field(26, ge=1)
+    signal: int = Field(9, ge=1)
+
+    @model_validator(mode='after')
+    def check_slow_greater_fast(self) -> "MACDParams":
+        if self.slow <= self.fast:
+            raise ValueError("'slow' must be greater than 'fast'")
+        return self
+
+# ─── MACD Kernel ──────────────────────────────────────────────────────────────
+@njit(readonly_args("UniTuple(f8, 3)(f8[:], i8, f8, f8, f8, i8, i8, i8)"), cache=True, nogil=True)
+def fold_macd_emas(
+    closes: np.ndarray, start: int, ef: float, es: float, sg: float,
+    fast: int, slow: int, signal: int
+) -> tuple[float, float, float]:
+    """
+    Carry (fast EMA, slow EMA, signal line) over closes[start:], one pass
+    kept in scalars: EMAs as ewm(span=..., adjust=False) and the signal line
+    as the same recursion over fast - slow. A cold start passes start=1,
+    ef = es = closes[0] and sg = 0.
+    """
+    af = 2.0 / (fast + 1.0)
+    asl = 2.0 / (slow + 1.0)
+    asg = 2.0 / (signal + 1.0)
+    for i in range(start, closes.shape[0]):
+        x = closes[i]
+        ef = af * x + (1.0 - af) * ef
+        es = asl * x + (1.0 - asl) * es
+        sg = asg * (ef - es) + (1.0 - asg) * sg
+    return ef, es, sg
+
 # ─── Base Runner ────────────────────────────────────────────────────────────
 class BaseStrategyRunner(threading.Thread):
     """
@@ -51,20 +88,23 @@ class BaseStrategyRunner(threading.Thread):
         except ValidationError as e:
             self.logger.error("Invalid parameters: %s", e)
             raise
+        # Dumped once: the callback gets the same plain dict every tick
+        self._params_dict = self.params.model_dump()
+        # Shared with the other runners: full history once, then only new candles
+        self._klines = shared_kline_cache(symbol, Client.KLINE_INTERVAL_4HOUR)
 
     @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _connect_client(self) -> Client:
         """Connect to Binance with retry on transient errors."""
         if self._client is None:
-            self._client = connect_binance_production()
+            self._client = get_shared_client()
         return self._client
 
     @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _fetch_klines(self) -> Any:
-        """Download 4h klines; error if empty."""
+        """Refresh the cached 4h window; error if empty."""
         client = self._connect_client()
-        df = fetch_klines_df(client, self.symbol,
-                             Client.KLINE_INTERVAL_4HOUR, "100 days ago UTC")
+        df = self._klines.refresh(client)
         if df.empty:
             raise ValueError("Empty kline data")
         return df
@@ -77,8 +117,7 @@ class BaseStrategyRunner(threading.Thread):
                 df = self._fetch_klines()
                 signal = self._compute_signal(df)
                 self.logger.info("Signal => %s", signal)
-                params_dump = self.params.model_dump()
-                self.on_signal(self.strategy_name, params_dump, signal)
+                self.on_signal(self.strategy_name, self._params_dict, signal)
 
             except BinanceAPIException as e:
                 self.logger.warning("Binance API error: %s", e)
@@ -104,6 +143,68 @@ class BaseStrategyRunner(threading.Thread):
         raise NotImplementedError
 
 
+# ─── Incremental MACD ─────────────────────────────────────────────────────────
+class _MACDTracker:
+    """
+    Fast EMA, slow EMA and signal line carried across runner ticks.
+
+    Closed candles are folded into the scalars once; the newest candle may
+    still be forming, so it is applied on top without being committed. A
+    full warm-up only happens on the first call or when the cached window
+    no longer contains the last folded candle.
+    """
+
+    def __init__(self, params: MACDParams):
+        self.params = params
+        self.af = 2.0 / (params.fast + 1.0)
+        self.asl = 2.0 / (params.slow + 1.0)
+        self.asg = 2.0 / (params.signal + 1.0)
+        self.reset()
+
+    def reset(self) -> None:
+        self.emas: Optional[tuple[float, float, float]] = None  # through the last closed candle
+        self.last_ts: Optional[int] = None  # open_time (ms) of that candle
+        self.last_bar: Optional[tuple[int, float]] = None  # (open_time, close) last evaluated
+        self.last_emit: Optional[tuple[int, str]] = None  # (open_time, BUY/SELL) last emitted
+
+    def update(self, closes: np.ndarray, open_ms: np.ndarray) -> Literal["BUY", "SELL", "HOLD"]:
+        """
+        Fold newly closed candles and return the MACD / signal-line cross on
+        the newest candle; HOLD until slow + signal closes are available.
+        A cross is emitted once per candle: later ticks on the same candle
+        answer HOLD, whether or not its close moved.
+        """
+        p = self.params
+        n = closes.shape[0]
+        if n < p.slow + p.signal or n < 2:
+            return "HOLD"
+        bar = (int(open_ms[-1]), float(closes[-1]))
+        if bar == self.last_bar:
+            return "HOLD"
+        self.last_bar = bar
+
+        k = -1 if self.last_ts is None else int(np.searchsorted(open_ms, self.last_ts))
+        if k < 0 or k >= n - 1 or open_ms[k] != self.last_ts:
+            # Cold start (or the window moved past our state): warm up on closed candles
+            self.emas = fold_macd_emas(closes[:-1], 1, closes[0], closes[0], 0.0,
+                                       p.fast, p.slow, p.signal)
+        elif k < n - 2:
+            self.emas = fold_macd_emas(closes[:-1], k + 1, *self.emas,
+                                       p.fast, p.slow, p.signal)
+        self.last_ts = int(open_ms[-2])
+
+        ef, es, sg = self.emas
+        x = float(closes[-1])
+        nf = self.af * x + (1.0 - self.af) * ef
+        ns = self.asl * x + (1.0 - self.asl) * es
+        m = nf - ns
+        nsg = self.asg * m + (1.0 - self.asg) * sg
+        signal = ("HOLD", "BUY", "SELL")[cross_code((ef - es) - sg, m - nsg)]
+        if signal == "HOLD" or (bar[0], signal) == self.last_emit:
+            return "HOLD"
+        self.last_emit = (bar[0], signal)
+        return signal
+
 # ─── MACD Runner ─────────────────────────────────────────────────────────────
 class MACDRunner(BaseStrategyRunner):
     def __init__(
@@ -119,9 +220,14 @@ class MACDRunner(BaseStrategyRunner):
     ):
         super().__init__(strategy_name, raw_params, on_signal, symbol,
                          interval_seconds, client, *args, **kwargs)
+        self._macd = _MACDTracker(self.params)
 
     def _validate_params(self, raw: Dict[str, Any]) -> MACDParams:
         return MACDParams(**raw)
 
-    def _compute_signal(self, df: Any) -> Literal["BUY","SELL","HOLD"]:
-        return compute_macd_signal(df, self.params)
+    def _compute_signal(self, df: pd.DataFrame) -> Literal["BUY","SELL","HOLD"]:
+        # Shared kline windows are chronological, so no reordering is needed
+        return self._macd.update(
+            df["close"].to_numpy(np.float64),
+            df["open_time"].to_numpy(dtype="datetime64[ms]").astype(np.int64),
+        )
@@ -8,7 +8,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
+from executor.binance_api import get_shared_client, fetch_klines_df
 
 # ─── Logger Setup ───────────────────────────────────────────────────────────
 logger = logging.getLogger("RangeTrading")
@@ -26,7 +26,7 @@ class RangeTradingParams(BaseModel):
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
 def _connect_client() -> Client:
     """Connect to Binance with retry on transient errors."""
-    return connect_binance_production()
+    return get_shared_client()
 
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
 def _fetch_klines(client: Client) -> pd.DataFrame:
@@ -39,25 +39,16 @@ def _fetch_klines(client: Client) -> pd.DataFrame:
 # ─── Pure Signal Computation ─────────────────────────────────────────────────
 def compute_range_signal(df: pd.DataFrame, params: RangeTradingParams) -> Literal["BUY", "SELL", "HOLD"]:
     """Compute BUY/SELL/HOLD based on range trading logic."""
-    df = (
-        df.rename(
-            columns={
-                "open_time": "date",
-                "high": "high_usd",
-                "low": "low_usd",
-                "close": "closing_price_usd"
-            }
-        )
-        .sort_values("date")
-        .reset_index(drop=True)
-    )
+    # Binance kline columns are used as is; sort only if out of order
+    if not df["open_time"].is_monotonic_increasing:
+        df = df.sort_values("open_time", ignore_index=True)
     period = params.period
     if len(df) < period:
         return "HOLD"
     window = df.iloc[-period:]
-    low = window["low_usd"].min()
-    high = window["high_usd"].max()
-    price = float(window["closing_price_usd"].iat[-1])
+    low = window["low"].min()
+    high = window["high"].max()
+    price = float(window["close"].iat[-1])
     if low <= 0:
         return "HOLD"
     range_abs = high - low
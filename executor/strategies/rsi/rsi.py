@@ -2,13 +2,14 @@
 
 import logging
 from typing import Any, Dict, Literal
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, ValidationError, ConfigDict, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
-from executor.binance_api import connect_binance_production, fetch_klines_df
+from executor.binance_api import get_shared_client, fetch_klines_df
 
 # ─── Logger Setup ───────────────────────────────────────────────────────────
 logger = logging.getLogger("RSI")
@@ -52,9 +53,9 @@ def _connect_client() -> Client:
         Connected Binance Client instance.
     
     Raises:
-        Any exception from connect_binance_production if unrecoverable.
+        Any exception from get_shared_client if unrecoverable.
     """
-    return connect_binance_production()
+    return get_shared_client()
 
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
 def _fetch_klines(client: Client, timeframe: str) -> pd.DataFrame:
@@ -84,7 +85,7 @@ def compute_rsi_value(df: pd.DataFrame, period: int) -> float | None:
     Compute RSI value from OHLC DataFrame.
     
     Args:
-        df: DataFrame with 'date', 'high_usd', 'low_usd', 'closing_price_usd'.
+        df: Binance kline DataFrame ('open_time', 'high', 'low', 'close', ...).
         period: Lookback window for RSI calculation.
     
     Returns:
@@ -95,31 +96,28 @@ def compute_rsi_value(df: pd.DataFrame, period: int) -> float | None:
         return None
 
     # Prepare series of gains and losses
-    df = df.rename(columns={
-        'open_time': 'date',
-        'high': 'high_usd',
-        'low': 'low_usd',
-        'close': 'closing_price_usd'
-    })
-    df = df.sort_values('date').reset_index(drop=True)
-    delta = df['closing_price_usd'].diff()
+    # Binance kline columns are used as is; sort only if out of order
+    if not df['open_time'].is_monotonic_increasing:
+        df = df.sort_values('open_time', ignore_index=True)
+    delta = df['close'].diff()
     gain = delta.clip(lower=0)
     loss = (-delta).clip(lower=0)
 
-    # Rolling averages
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
+    # Rolling averages: only the last window is read (NaN if it holds the
+    # first candle, whose diff is NaN)
+    avg_gain = gain.to_numpy(np.float64)[-period:].mean()
+    avg_loss = loss.to_numpy(np.float64)[-period:].mean()
 
     # Check for NaN due to insufficient data
-    if avg_gain.iat[-1] is pd.NA or avg_loss.iat[-1] is pd.NA:
+    if np.isnan(avg_gain) or np.isnan(avg_loss):
         logger.warning("RSI avg_gain/loss NaN => insufficient data.")
         return None
 
     # Handle divide-by-zero: if no losses, RSI=100
-    if avg_loss.iat[-1] == 0:
+    if avg_loss == 0:
         return 100.0
 
-    rs = avg_gain.iat[-1] / avg_loss.iat[-1]
+    rs = avg_gain / avg_loss
     return 100.0 - (100.0 / (1.0 + rs))
 
 # ─── Entrypoint ───────────────────────────────────────────────────────────────
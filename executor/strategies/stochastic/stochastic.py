@@ -1,7 +1,9 @@
 # tfg_bot_trading/executor/strategies/stochastic/stochastic.py
 
 import logging
+from math import isnan
 from typing import Any, Dict, Literal
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, ValidationError, ConfigDict, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -59,29 +61,22 @@ def compute_stochastic_signal(
     """
     Compute the instantaneous signal (BUY/SELL/HOLD) based on %K oscillator.
     """
-    # Rename columns for consistency
-    df = df.rename(columns={
-        "open": "open_usd",
-        "high": "high_usd",
-        "low": "low_usd",
-        "close": "closing_price_usd"
-    })
     k = params.k_period
     d = params.d_period
-    window = df.copy()
-    window["lowest_low"] = window["low_usd"].rolling(window=k, min_periods=k).min()
-    window["highest_high"] = window["high_usd"].rolling(window=k, min_periods=k).max()
-    if pd.isna(window["lowest_low"].iat[-1]) or pd.isna(window["highest_high"].iat[-1]):
+    n = len(df)
+    if n < k:
         return "HOLD"
-    # %K calculation
-    range_ = window["highest_high"] - window["lowest_low"]
-    window["K"] = 100 * ((window["closing_price_usd"] - window["lowest_low"]) / (range_ + 1e-9))
-    if len(window) < k + d - 1:
+    # Only the last %K is used: one min / max over the last k candles
+    lowest_low = float(df["low"].to_numpy(np.float64)[-k:].min())
+    highest_high = float(df["high"].to_numpy(np.float64)[-k:].max())
+    if isnan(lowest_low) or isnan(highest_high):
+        return "HOLD"
+    if n < k + d - 1:
         return "HOLD"
-    # %D not required for signal but computed for completeness
-    window["D"] = window["K"].rolling(window=d, min_periods=d).mean()
-    last_k = window["K"].iat[-1]
-    if pd.isna(last_k):
+    # %K calculation
+    last_close = float(df["close"].iat[-1])
+    last_k = 100 * ((last_close - lowest_low) / (highest_high - lowest_low + 1e-9))
+    if isnan(last_k):
         return "HOLD"
     if last_k > params.overbought:
         return "SELL"
@@ -48,10 +48,10 @@ class StrategyRunner(threading.Thread):
             try:
                 # Placeholder for actual strategy execution:
                 # result = run_strategy(self.data_json, self.strategy_params)
-                logging.debug(f"[StrategyRunner] '{self.strategy_name}' executing...")
+                logging.debug("[StrategyRunner] '%s' executing...", self.strategy_name)
                 self.stop_event.wait(self.interval_seconds)
             except Exception as e:
-                logging.error(f"[StrategyRunner] Error in '{self.strategy_name}': {e}")
+                logging.error("[StrategyRunner] Error in '%s': %s", self.strategy_name, e)
         logging.info(f"[StrategyRunner] '{self.strategy_name}' thread stopped.")
 
     def stop(self):
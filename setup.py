@@ -33,6 +33,7 @@ setup(
         "python-dotenv>=1.0.0",
         "pandas>=2.0.0",
         "numpy>=1.24.0",
+        "orjson>=3.9.0",
         "requests>=2.31.0",
         "python-dateutil>=2.8.2",
         "tabulate>=0.9.0",